@@ -6,103 +6,368 @@ Connects to a remote Raspberry Pi via SSH and collects comprehensive
 health metrics to diagnose potential crash causes.
 """
 
-import subprocess
-import json
+import asyncio
 import datetime
-import time
+import gzip
 import logging
 import argparse
+import re
+import signal
 import sys
+import time
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import asyncssh
+import orjson
+
+# df -h data lines: device, size, used, available, use%, mount point.
+# Compiled once at import so the hot parsing loops don't rebuild it.
+_DF_LINE = re.compile(r'^(/dev/\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)%\s+(.+)$')
+
 
 class RPiMonitor:
+    #: Remote commands for each metric group. All commands are shipped to
+    #: the Pi in a single SSH invocation per cycle (see _run_batch), with the
+    #: combined output split back into sections by marker lines.
+    COMMANDS = {
+        'system_info': {
+            'uptime': "cat /proc/uptime",
+            'boot_id': "cat /proc/sys/kernel/random/boot_id",
+        },
+        'cpu_metrics': {
+            # Two /proc/stat samples 100ms apart; usage is computed from
+            # the delta so no remote 'top' (which sleeps a full second).
+            # Only the aggregate cpu line is shipped, not the per-core ones.
+            'cpu_stat': "head -1 /proc/stat; sleep 0.1; head -1 /proc/stat",
+            'load_avg': "cat /proc/loadavg",
+            'cpu_temp': "cat /sys/class/thermal/thermal_zone0/temp",
+            'cpu_freq': "cat /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq",
+        },
+        'memory_metrics': {
+            'mem_info': "cat /proc/meminfo",
+        },
+        'disk_metrics': {
+            'disk_usage': "df -h",
+            'iostat': "iostat -d 1 2 | tail -n +4",
+        },
+        'network_metrics': {
+            'interfaces': "ip addr show",
+            # TCP connect to a public DNS server; 'ping -c 3' sat through
+            # three 1-second probes, this answers in one round-trip
+            'connectivity': "timeout 2 bash -c '</dev/tcp/8.8.8.8/53' && echo up || echo down",
+            'connections': "ss -tuln",
+        },
+        'process_metrics': {
+            # Only the five fields we keep, pre-sorted and trimmed on the
+            # Pi, instead of shipping full 'ps aux' output
+            'top_cpu': "ps -eo pid,user,pcpu,pmem,comm --sort=-pcpu --no-headers | head -10",
+            'top_mem': "ps -eo pid,user,pcpu,pmem,comm --sort=-pmem --no-headers | head -10",
+            'proc_count': "ls -d /proc/[0-9]* | wc -l",
+            'failed_services': "systemctl --failed --no-legend",
+        },
+        'log_errors': {
+            'kernel_errors': "dmesg | grep -i error | tail -10",
+            # Overridden per cycle by _syslog_command so the lookback
+            # matches the actual gap between log collections
+            'syslog_errors': "journalctl --since='24 hours ago' -p err --no-pager | tail -50",
+        },
+    }
+
+    #: Cheap health probe run before each full collection: evaluates the
+    #: alert inputs on the Pi and ships back just two numbers
+    #: (temperature in millidegrees, memory usage in percent)
+    PROBE_COMMAND = (
+        "t=$(cat /sys/class/thermal/thermal_zone0/temp); "
+        "m=$(awk '/MemTotal/{t=$2}/MemAvailable/{a=$2}END{print int((t-a)*100/t)}' /proc/meminfo); "
+        'echo "$t $m"'
+    )
+
+    #: A full collection runs at least every this many cycles even while
+    #: the Pi stays healthy
+    HEARTBEAT_EVERY = 10
+
+    #: Facts that only change across reboots - collected once per boot
+    #: (keyed on boot_id) and served from cache on later cycles
+    STATIC_COMMANDS = {
+        'kernel_version': "cat /proc/version",
+        'os_version': "cat /etc/os-release",
+    }
+
+    #: How often each metric group is collected, in cycles. The cheap
+    #: /proc reads carry the alerting signal and go every cycle; the slow
+    #: or slow-moving groups (iostat sleeps 1s; disk sizes, interface
+    #: config and journal errors barely change between cycles) are
+    #: sampled less often and reused from cache between collections.
+    GROUP_PERIODS = {
+        'system_info': 1,
+        'cpu_metrics': 1,
+        'memory_metrics': 1,
+        'process_metrics': 1,
+        'disk_metrics': 10,
+        'network_metrics': 5,
+        'log_errors': 5,
+    }
+
     def __init__(self, hostname: str, username: str = 'pi', key_path: Optional[str] = None):
         self.hostname = hostname
         self.username = username
         self.key_path = key_path
         self.log_dir = Path('./rpi_logs')
         self.log_dir.mkdir(exist_ok=True)
+
+        # One long-lived SSH connection shared by all commands - opened
+        # lazily on first use and re-opened if the Pi drops it
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+
+        # Cap concurrent SSH sessions below sshd's default MaxSessions
+        self._sem = asyncio.Semaphore(8)
+
+        # Set by SIGINT/SIGTERM; the continuous loop waits on this instead
+        # of sleeping so shutdown is prompt mid-interval
+        self._stop = asyncio.Event()
+
+        # Adaptive sampling: monitor_once adjusts _next_interval from the
+        # latest readings so hot systems are sampled more often
+        self._base_interval = 300
+        self._next_interval = 300
+
+        # Previous cycle's metrics for delta snapshots (see save_metrics)
+        self._last_metrics = None
+        self._cycles_since_baseline = 0
+
+        # Per-boot facts, re-collected only when boot_id changes
+        self._boot_id = None
+        self._static_cache = {}
+
+        # Detected remote layouts (e.g. meminfo line positions) - fixed
+        # per kernel, so detected once per boot rather than every cycle
+        self._schemas = {}
+
+        # Tiered sampling: cycle counter plus the last parsed value of
+        # each group, reused on cycles where the group isn't due
+        self._cycle = 0
+        self._group_cache = {}
+
+        # Alert-gated collection: probe counter and whether the last
+        # probe was in the alert state (see monitor_once)
+        self._probe_count = 0
+        self._alert_state = False
+
+        # When the journal was last scanned, so the next scan's lookback
+        # covers the whole gap (see _syslog_command). The pending value
+        # is only promoted once the scan's batch actually succeeds.
+        self._last_log_check = None
+        self._pending_log_check = None
         
-        # Setup logging
-        log_file = self.log_dir / f'rpi_monitor_{hostname}_{datetime.datetime.now().strftime("%Y%m%d")}.log'
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # Setup logging: a named per-host logger, with handler setup
+        # guarded so repeated instantiation doesn't stack duplicate
+        # handlers (basicConfig would also hijack the root logger). The
+        # handler rotates at midnight instead of baking the date into the
+        # filename.
+        log_file = self.log_dir / f'rpi_monitor_{hostname}.log'
+        logger = logging.getLogger(f'rpi.{hostname}')
+        if not logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler = TimedRotatingFileHandler(log_file, when='midnight', backupCount=14)
+            file_handler.setFormatter(formatter)
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+            logger.addHandler(stream_handler)
+            logger.setLevel(logging.INFO)
+        self.logger = logger
+
+    async def _ensure_conn(self) -> asyncssh.SSHClientConnection:
+        """Open the shared SSH connection if it isn't up yet and return it"""
+        async with self._conn_lock:
+            if self._conn is None:
+                client_keys = [self.key_path] if self.key_path else None
+                self._conn = await asyncssh.connect(
+                    self.hostname,
+                    username=self.username,
+                    client_keys=client_keys,
+                    known_hosts=None,
+                    connect_timeout=10
+                )
+            return self._conn
+
+    async def _invalidate_conn(self, conn: Optional[asyncssh.SSHClientConnection]) -> None:
+        """Close a dead connection and drop the shared reference to it
+
+        The comparison against the instance the failing command was using
+        happens under the lock, so a command failing late can't null out
+        a fresh connection another task has already opened.
+        """
+        async with self._conn_lock:
+            if conn is not None and conn is self._conn:
+                self._conn = None
+
+        if conn is not None:
+            try:
+                conn.abort()
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        """Tear down the shared SSH connection and wait for it to drain
+
+        Must run inside the event loop the connection was opened on -
+        asyncssh schedules its teardown on that loop, so closing after
+        asyncio.run() has returned is too late.
+        """
+        async with self._conn_lock:
+            conn, self._conn = self._conn, None
+
+        if conn is None:
+            return
 
-    def _run_remote_command(self, command: str) -> Optional[str]:
-        """Execute a command on the remote Raspberry Pi via SSH"""
         try:
-            ssh_cmd = ['ssh', '-o', 'ConnectTimeout=10', '-o', 'StrictHostKeyChecking=no']
-            
-            if self.key_path:
-                ssh_cmd.extend(['-i', self.key_path])
-            
-            ssh_cmd.append(f'{self.username}@{self.hostname}')
-            ssh_cmd.append(command)
-            
-            result = subprocess.run(
-                ssh_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                self.logger.error(f"Command failed: {command}, Error: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            self.logger.error(f"Command timed out: {command}")
-            return None
+            conn.close()
+            await conn.wait_closed()
         except Exception as e:
-            self.logger.error(f"SSH connection failed: {e}")
+            self.logger.warning(f"Failed to close SSH connection: {e}")
+
+    def close(self) -> None:
+        """Best-effort synchronous fallback for aclose
+
+        Only drops the reference (and aborts if the loop happens to still
+        be alive); the real teardown is aclose, awaited before the event
+        loop exits.
+        """
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.abort()
+            except Exception:
+                pass
+
+    async def _run_remote_command(self, command: str) -> Optional[str]:
+        """Execute a command on the remote Raspberry Pi over the shared SSH connection
+
+        If the connection was lost (Pi rebooted, network blip), it is
+        re-opened once and the command retried before giving up.
+        """
+        for attempt in range(2):
+            conn = None
+            try:
+                conn = await self._ensure_conn()
+
+                async with self._sem:
+                    # Take bytes off the wire and decode once at the end -
+                    # a single C-level UTF-8 pass instead of the channel's
+                    # incremental text decoding on every chunk
+                    result = await conn.run(command, timeout=30, encoding=None)
+
+                if result.exit_status == 0:
+                    return result.stdout.decode('utf-8', 'replace').strip()
+                else:
+                    stderr = result.stderr.decode('utf-8', 'replace')
+                    self.logger.error(f"Command failed: {command}, Error: {stderr}")
+                    return None
+
+            except asyncssh.TimeoutError:
+                self.logger.error(f"Command timed out: {command}")
+                return None
+            except (asyncssh.ConnectionLost, ConnectionError, OSError) as e:
+                await self._invalidate_conn(conn)
+                if attempt == 0:
+                    self.logger.warning(f"SSH connection lost, reconnecting: {e}")
+                    continue
+                self.logger.error(f"SSH connection failed: {e}")
+                return None
+            except Exception as e:
+                self.logger.error(f"SSH connection failed: {e}")
+                return None
+
+    async def _run_batch(self, commands: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Run a group of commands in one SSH invocation and split the output
+
+        The commands are joined into a single shell script with a unique
+        marker echoed after each one, so a whole group costs one SSH
+        round-trip instead of one per command. Returns a dict mapping each
+        command key to its output section (an empty string when the
+        command produced no output), or None when the SSH round-trip
+        itself failed - callers can tell "nothing to report" apart from
+        "couldn't ask".
+        """
+        if not commands:
+            return {}
+
+        script = '; '.join(
+            f'{{ {command} ; }} 2>/dev/null; echo "__RPI_SEP_{key}__"'
+            for key, command in commands.items()
+        )
+
+        combined = await self._run_remote_command(script)
+        if combined is None:
             return None
 
-    def get_system_info(self) -> Dict[str, Any]:
-        """Collect basic system information"""
+        outputs = {}
+        remainder = combined
+        for key in commands:
+            section, sep, remainder = remainder.partition(f'__RPI_SEP_{key}__')
+            if not sep:
+                break
+            outputs[key] = section.strip()
+
+        return outputs
+
+    def get_system_info(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse basic system information"""
         info = {}
-        
-        # System uptime
-        uptime = self._run_remote_command("uptime")
+
+        # System uptime (seconds since boot, from /proc/uptime)
+        uptime = outputs.get('uptime')
         if uptime:
-            info['uptime'] = uptime
-            
-        # Kernel version
-        kernel = self._run_remote_command("uname -r")
+            try:
+                info['uptime_seconds'] = float(uptime.split()[0])
+            except (ValueError, IndexError):
+                pass
+
+        # Kernel version ("Linux version 6.1.21-v8+ ..." from /proc/version)
+        kernel = outputs.get('kernel_version')
         if kernel:
-            info['kernel_version'] = kernel
-            
+            parts = kernel.split()
+            if len(parts) >= 3:
+                info['kernel_version'] = parts[2]
+
         # OS version
-        os_version = self._run_remote_command("cat /etc/os-release | grep PRETTY_NAME")
+        os_version = outputs.get('os_version')
         if os_version:
-            info['os_version'] = os_version.split('=')[1].strip('"')
-            
+            for line in os_version.splitlines():
+                if line.startswith('PRETTY_NAME='):
+                    info['os_version'] = line.split('=', 1)[1].strip('"')
+                    break
+
         return info
 
-    def get_cpu_metrics(self) -> Dict[str, Any]:
-        """Collect CPU-related metrics"""
+    def get_cpu_metrics(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse CPU-related metrics"""
         metrics = {}
-        
-        # CPU usage
-        cpu_usage = self._run_remote_command("top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1")
-        if cpu_usage:
-            try:
-                metrics['cpu_usage_percent'] = float(cpu_usage)
-            except ValueError:
-                pass
-                
+
+        # CPU usage from the delta between the two /proc/stat samples
+        cpu_stat = outputs.get('cpu_stat')
+        if cpu_stat:
+            samples = [line.split()[1:] for line in cpu_stat.splitlines()
+                       if line.startswith('cpu ')]
+            if len(samples) >= 2:
+                try:
+                    first = [int(x) for x in samples[0]]
+                    last = [int(x) for x in samples[-1]]
+                    # Fields: user nice system idle iowait irq softirq ...
+                    idle_delta = (last[3] + last[4]) - (first[3] + first[4])
+                    total_delta = sum(last) - sum(first)
+                    if total_delta > 0:
+                        metrics['cpu_usage_percent'] = round(
+                            100.0 * (total_delta - idle_delta) / total_delta, 1)
+                except (ValueError, IndexError):
+                    pass
+
         # Load average
-        load_avg = self._run_remote_command("cat /proc/loadavg")
+        load_avg = outputs.get('load_avg')
         if load_avg:
             loads = load_avg.split()[:3]
             metrics['load_average'] = {
@@ -110,233 +375,504 @@ class RPiMonitor:
                 '5min': float(loads[1]),
                 '15min': float(loads[2])
             }
-            
-        # CPU temperature
-        temp = self._run_remote_command("vcgencmd measure_temp")
+
+        # CPU temperature (millidegrees in sysfs)
+        temp = outputs.get('cpu_temp')
         if temp:
             try:
-                temp_val = temp.replace("temp=", "").replace("'C", "")
-                metrics['cpu_temperature_c'] = float(temp_val)
+                metrics['cpu_temperature_c'] = int(temp) / 1000.0
             except ValueError:
                 pass
-                
-        # CPU frequency
-        freq = self._run_remote_command("vcgencmd measure_clock arm")
+
+        # CPU frequency (kHz in sysfs)
+        freq = outputs.get('cpu_freq')
         if freq:
             try:
-                freq_val = freq.split('=')[1]
-                metrics['cpu_frequency_hz'] = int(freq_val)
-            except (ValueError, IndexError):
+                metrics['cpu_frequency_hz'] = int(freq) * 1000
+            except ValueError:
                 pass
-                
+
         return metrics
 
-    def get_memory_metrics(self) -> Dict[str, Any]:
-        """Collect memory usage metrics"""
+    #: The /proc/meminfo fields the memory parser reads
+    _MEMINFO_KEYS = ('MemTotal', 'MemFree', 'MemAvailable', 'SwapTotal', 'SwapFree')
+
+    @classmethod
+    def _meminfo_schema(cls, lines: list) -> Dict[str, int]:
+        """Map the meminfo keys we use to their line numbers
+
+        /proc/meminfo layout is fixed per kernel, so this scan runs once
+        per boot; the per-cycle parser then reads the bound line numbers
+        straight through instead of re-scanning the whole file.
+        """
+        schema = {}
+        for idx, line in enumerate(lines):
+            key = line.split(':', 1)[0]
+            if key in cls._MEMINFO_KEYS:
+                schema[key] = idx
+        return schema
+
+    def get_memory_metrics(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse memory usage metrics"""
         metrics = {}
-        
-        # Memory usage
-        mem_info = self._run_remote_command("free -m")
+
+        # RAM and swap usage, all from /proc/meminfo (values in kB)
+        mem_info = outputs.get('mem_info')
         if mem_info:
-            lines = mem_info.split('\n')
-            if len(lines) >= 2:
-                mem_line = lines[1].split()
+            lines = mem_info.splitlines()
+
+            schema = self._schemas.get('meminfo')
+            if schema is None or not all(idx < len(lines) and lines[idx].startswith(key)
+                                         for key, idx in schema.items()):
+                schema = self._meminfo_schema(lines)
+                self._schemas['meminfo'] = schema
+
+            fields = {}
+            for key, idx in schema.items():
+                parts = lines[idx].split()
+                if len(parts) >= 2:
+                    try:
+                        fields[key] = int(parts[1])
+                    except ValueError:
+                        pass
+
+            if fields.get('MemTotal', 0) >= 1024:
+                total_mb = fields['MemTotal'] // 1024
+                free_mb = fields.get('MemFree', 0) // 1024
+                available_mb = fields.get('MemAvailable', fields.get('MemFree', 0)) // 1024
+                used_mb = total_mb - available_mb
                 metrics['memory'] = {
-                    'total_mb': int(mem_line[1]),
-                    'used_mb': int(mem_line[2]),
-                    'free_mb': int(mem_line[3]),
-                    'available_mb': int(mem_line[6]) if len(mem_line) > 6 else int(mem_line[3])
+                    'total_mb': total_mb,
+                    'used_mb': used_mb,
+                    'free_mb': free_mb,
+                    'available_mb': available_mb,
+                    'usage_percent': (used_mb / total_mb) * 100
                 }
-                metrics['memory']['usage_percent'] = (metrics['memory']['used_mb'] / metrics['memory']['total_mb']) * 100
-                
-        # Swap usage
-        swap_info = self._run_remote_command("swapon --show --noheadings")
-        if swap_info:
-            swap_lines = swap_info.strip().split('\n')
-            if swap_lines and swap_lines[0]:
-                swap_parts = swap_lines[0].split()
-                if len(swap_parts) >= 4:
-                    metrics['swap'] = {
-                        'size': swap_parts[1],
-                        'used': swap_parts[2],
-                        'usage_percent': float(swap_parts[4].rstrip('%'))
-                    }
-        
+
+            if fields.get('SwapTotal'):
+                swap_total = fields['SwapTotal']
+                swap_used = swap_total - fields.get('SwapFree', 0)
+                metrics['swap'] = {
+                    'total_mb': swap_total // 1024,
+                    'used_mb': swap_used // 1024,
+                    'usage_percent': (swap_used / swap_total) * 100
+                }
+
         return metrics
 
-    def get_disk_metrics(self) -> Dict[str, Any]:
-        """Collect disk usage and I/O metrics"""
+    def get_disk_metrics(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse disk usage and I/O metrics"""
         metrics = {}
-        
+
         # Disk usage
-        disk_usage = self._run_remote_command("df -h")
+        disk_usage = outputs.get('disk_usage')
         if disk_usage:
-            lines = disk_usage.split('\n')[1:]  # Skip header
             disks = []
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 6 and parts[0].startswith('/dev/'):
+            for match in (_DF_LINE.match(line) for line in disk_usage.splitlines()):
+                if match:
+                    device, size, used, available, usage, mount_point = match.groups()
                     disks.append({
-                        'device': parts[0],
-                        'size': parts[1],
-                        'used': parts[2],
-                        'available': parts[3],
-                        'usage_percent': parts[4].rstrip('%'),
-                        'mount_point': parts[5]
+                        'device': device,
+                        'size': size,
+                        'used': used,
+                        'available': available,
+                        'usage_percent': usage,
+                        'mount_point': mount_point
                     })
             metrics['disk_usage'] = disks
             
         # I/O statistics
-        iostat = self._run_remote_command("iostat -d 1 2 | tail -n +4")
+        iostat = outputs.get('iostat')
         if iostat:
             metrics['disk_io'] = iostat
             
         return metrics
 
-    def get_network_metrics(self) -> Dict[str, Any]:
-        """Collect network-related metrics"""
+    def get_network_metrics(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse network-related metrics"""
         metrics = {}
-        
+
         # Network interfaces
-        interfaces = self._run_remote_command("ip addr show")
+        interfaces = outputs.get('interfaces')
         if interfaces:
             metrics['network_interfaces'] = interfaces
-            
+
         # Network connectivity test
-        ping_test = self._run_remote_command("ping -c 3 8.8.8.8")
-        if ping_test:
-            metrics['internet_connectivity'] = 'ping successful' in ping_test or '3 received' in ping_test
-        else:
-            metrics['internet_connectivity'] = False
+        connectivity = outputs.get('connectivity')
+        metrics['internet_connectivity'] = connectivity == 'up'
             
         # Active connections
-        connections = self._run_remote_command("ss -tuln")
+        connections = outputs.get('connections')
         if connections:
-            metrics['active_connections'] = len(connections.split('\n')) - 1
+            metrics['active_connections'] = len(connections.splitlines()) - 1
             
         return metrics
 
-    def get_process_metrics(self) -> Dict[str, Any]:
-        """Collect process and service information"""
+    @staticmethod
+    def _parse_process_list(output: str) -> list:
+        """Parse 'ps -eo pid,user,pcpu,pmem,comm' lines into dicts"""
+        processes = []
+        for line in output.splitlines():
+            parts = line.split(None, 4)
+            if len(parts) == 5:
+                try:
+                    processes.append({
+                        'pid': int(parts[0]),
+                        'user': parts[1],
+                        'cpu_percent': float(parts[2]),
+                        'memory_percent': float(parts[3]),
+                        'command': parts[4]
+                    })
+                except ValueError:
+                    pass
+        return processes
+
+    def get_process_metrics(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse process and service information"""
         metrics = {}
-        
+
         # Top processes by CPU
-        top_cpu = self._run_remote_command("ps aux --sort=-%cpu | head -10")
+        top_cpu = outputs.get('top_cpu')
         if top_cpu:
-            metrics['top_cpu_processes'] = top_cpu
-            
+            metrics['top_cpu_processes'] = self._parse_process_list(top_cpu)
+
         # Top processes by memory
-        top_mem = self._run_remote_command("ps aux --sort=-%mem | head -10")
+        top_mem = outputs.get('top_mem')
         if top_mem:
-            metrics['top_memory_processes'] = top_mem
-            
+            metrics['top_memory_processes'] = self._parse_process_list(top_mem)
+
         # Process count
-        proc_count = self._run_remote_command("ps aux | wc -l")
+        proc_count = outputs.get('proc_count')
         if proc_count:
             try:
-                metrics['total_processes'] = int(proc_count) - 1  # Subtract header
+                metrics['total_processes'] = int(proc_count)
             except ValueError:
                 pass
                 
         # Failed services
-        failed_services = self._run_remote_command("systemctl --failed --no-legend")
+        failed_services = outputs.get('failed_services')
         if failed_services:
-            metrics['failed_services'] = failed_services.split('\n') if failed_services.strip() else []
+            metrics['failed_services'] = failed_services.splitlines() if failed_services.strip() else []
             
         return metrics
 
-    def get_log_errors(self) -> Dict[str, Any]:
-        """Check for recent errors in system logs"""
+    def _syslog_command(self) -> str:
+        """Build the journalctl command with a lookback covering the gap
+
+        Log errors are only sampled every few full collections, and full
+        collections are themselves gated behind the health probe, so a
+        fixed one-hour window would silently miss most journal errors.
+        The window instead starts where the previous scan left off, with
+        a 24-hour default for the first scan after startup.
+        """
+        if self._last_log_check is not None:
+            since = self._last_log_check.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            since = '24 hours ago'
+        # Only a candidate for now - collect_all_metrics promotes it to
+        # _last_log_check once the batch succeeds, so a failed round-trip
+        # doesn't punch a hole in the scanned window
+        self._pending_log_check = datetime.datetime.now()
+
+        return f"journalctl --since='{since}' -p err --no-pager | tail -50"
+
+    def get_log_errors(self, outputs: Dict[str, str]) -> Dict[str, Any]:
+        """Parse recent errors from system logs"""
         metrics = {}
-        
+
         # Recent kernel errors
-        kernel_errors = self._run_remote_command("dmesg | grep -i error | tail -10")
+        kernel_errors = outputs.get('kernel_errors')
         if kernel_errors:
-            metrics['recent_kernel_errors'] = kernel_errors.split('\n')
-            
+            metrics['recent_kernel_errors'] = kernel_errors.splitlines()
+
         # Recent syslog errors
-        syslog_errors = self._run_remote_command("journalctl --since='1 hour ago' -p err --no-pager | tail -20")
+        syslog_errors = outputs.get('syslog_errors')
         if syslog_errors:
-            metrics['recent_syslog_errors'] = syslog_errors.split('\n')
+            metrics['recent_syslog_errors'] = syslog_errors.splitlines()
             
         return metrics
 
-    def collect_all_metrics(self) -> Dict[str, Any]:
-        """Collect comprehensive system metrics"""
+    async def collect_all_metrics(self) -> Dict[str, Any]:
+        """Collect comprehensive system metrics
+
+        The metric groups are independent and network-bound, so their
+        batched SSH invocations run concurrently - cycle time is that of
+        the slowest group rather than the sum of all of them.
+        """
         timestamp = datetime.datetime.now().isoformat()
-        
+
         self.logger.info(f"Starting health check for {self.hostname}")
-        
-        metrics = {
-            'timestamp': timestamp,
-            'hostname': self.hostname,
-            'system_info': self.get_system_info(),
-            'cpu_metrics': self.get_cpu_metrics(),
-            'memory_metrics': self.get_memory_metrics(),
-            'disk_metrics': self.get_disk_metrics(),
-            'network_metrics': self.get_network_metrics(),
-            'process_metrics': self.get_process_metrics(),
-            'log_errors': self.get_log_errors()
+
+        self._cycle += 1
+        due = [name for name in self.COMMANDS
+               if (self._cycle - 1) % self.GROUP_PERIODS.get(name, 1) == 0]
+
+        due_commands = {name: self.COMMANDS[name] for name in due}
+        if 'log_errors' in due_commands:
+            due_commands['log_errors'] = dict(due_commands['log_errors'],
+                                              syslog_errors=self._syslog_command())
+
+        group_outputs = await asyncio.gather(
+            *(self._run_batch(due_commands[name]) for name in due)
+        )
+        outputs = {}
+        collected = set()
+        for name, group_output in zip(due, group_outputs):
+            if group_output is not None:
+                outputs.update(group_output)
+                collected.add(name)
+
+        # The journal scan reached the Pi, so the next lookback can start
+        # here; on failure _last_log_check stays put and the window is
+        # re-scanned next time
+        if 'log_errors' in collected and self._pending_log_check is not None:
+            self._last_log_check = self._pending_log_check
+
+        # Kernel and OS version only change across reboots; refetch them
+        # only when the Pi's boot_id differs from the cached one
+        boot_id = outputs.get('boot_id')
+        if boot_id and boot_id != self._boot_id:
+            static = await self._run_batch(self.STATIC_COMMANDS)
+            # If the fetch failed, leave _boot_id alone so it is retried
+            # next cycle
+            if static is not None:
+                self._static_cache = static
+                self._boot_id = boot_id
+                # A reboot may mean a new kernel, so detected layouts and
+                # the pre-reboot group values are both stale
+                self._schemas = {}
+                self._group_cache = {}
+        outputs.update(self._static_cache)
+
+        parsers = {
+            'system_info': self.get_system_info,
+            'cpu_metrics': self.get_cpu_metrics,
+            'memory_metrics': self.get_memory_metrics,
+            'disk_metrics': self.get_disk_metrics,
+            'network_metrics': self.get_network_metrics,
+            'process_metrics': self.get_process_metrics,
+            'log_errors': self.get_log_errors,
         }
-        
+
+        metrics = {'timestamp': timestamp, 'hostname': self.hostname}
+        for name, parser in parsers.items():
+            if name in due:
+                # Only replace the cached value when the group's batch
+                # actually came back - a failed SSH round-trip would
+                # otherwise be served as empty "current" data until the
+                # group is next due. An all-empty but successful batch
+                # does replace it (e.g. the errors really have cleared).
+                if name in collected or name not in self._group_cache:
+                    self._group_cache[name] = parser(outputs)
+            metrics[name] = self._group_cache.get(name, {})
+
         return metrics
 
+    #: A full snapshot is written every this many cycles; the cycles in
+    #: between only record what changed
+    BASELINE_EVERY = 10
+
+    #: Snapshots older than this many days are pruned each cycle
+    RETENTION_DAYS = 14
+
+    @staticmethod
+    def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Return only the leaves of new that differ from old"""
+        changed = {}
+        for key, value in new.items():
+            if key not in old:
+                changed[key] = value
+            elif isinstance(value, dict) and isinstance(old[key], dict):
+                sub = RPiMonitor._diff(old[key], value)
+                if sub:
+                    changed[key] = sub
+            elif value != old[key]:
+                changed[key] = value
+        return changed
+
     def save_metrics(self, metrics: Dict[str, Any]) -> None:
-        """Save metrics to JSON file"""
+        """Save metrics to JSON file
+
+        Most values (kernel version, disk sizes, interfaces) rarely change
+        between cycles, so after a full baseline snapshot only the fields
+        that differ from the previous cycle are written, as a
+        health_delta_*.json file. A fresh baseline goes out every
+        BASELINE_EVERY cycles so any point in time can be reconstructed
+        from the nearest baseline plus the deltas after it.
+        """
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.log_dir / f'health_check_{self.hostname}_{timestamp}.json'
-        
+
+        if self._last_metrics is None or self._cycles_since_baseline >= self.BASELINE_EVERY:
+            payload = metrics
+            filename = self.log_dir / f'health_check_{self.hostname}_{timestamp}.json.gz'
+            self._cycles_since_baseline = 0
+        else:
+            delta = self._diff(self._last_metrics, metrics)
+            delta.pop('timestamp', None)
+            delta.pop('hostname', None)
+            payload = {
+                'timestamp': metrics.get('timestamp'),
+                'hostname': metrics.get('hostname'),
+                'delta': delta
+            }
+            filename = self.log_dir / f'health_delta_{self.hostname}_{timestamp}.json.gz'
+
+        self._cycles_since_baseline += 1
+        self._last_metrics = metrics
+
         try:
-            with open(filename, 'w') as f:
-                json.dump(metrics, f, indent=2)
+            # Compact gzipped write - JSON compresses ~10x, so long-running
+            # monitors don't slowly fill the disk; use zcat+jq to inspect
+            with gzip.open(filename, 'wb') as f:
+                f.write(orjson.dumps(payload))
             self.logger.info(f"Metrics saved to {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save metrics: {e}")
 
-    def monitor_once(self) -> bool:
-        """Perform a single monitoring cycle"""
+        self._prune_snapshots()
+
+    def _prune_snapshots(self) -> None:
+        """Delete snapshot files older than RETENTION_DAYS"""
+        cutoff = time.time() - self.RETENTION_DAYS * 86400
+
+        for pattern in (f'health_check_{self.hostname}_*.json.gz',
+                        f'health_delta_{self.hostname}_*.json.gz'):
+            for path in self.log_dir.glob(pattern):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                except OSError as e:
+                    self.logger.warning(f"Failed to prune {path}: {e}")
+
+    async def _probe_health(self) -> Optional[tuple]:
+        """Run the cheap remote health probe
+
+        Returns (cpu_temperature_c, memory_usage_percent), or None when
+        the probe failed or produced unparseable output.
+        """
+        output = await self._run_remote_command(self.PROBE_COMMAND)
+        if not output:
+            return None
+
+        try:
+            temp_millic, mem_pct = output.split()
+            return int(temp_millic) / 1000.0, float(mem_pct)
+        except ValueError:
+            return None
+
+    async def monitor_once(self) -> bool:
+        """Perform a single monitoring cycle
+
+        A few-byte probe evaluates the alert inputs on the Pi first; the
+        full metric collection and snapshot only happen when an alert is
+        active, the alert state just changed, or the periodic heartbeat
+        is due. A healthy steady-state cycle costs one tiny SSH command.
+        """
         try:
-            metrics = self.collect_all_metrics()
+            probe = await self._probe_health()
+            self._probe_count += 1
+            heartbeat_due = (self._probe_count - 1) % self.HEARTBEAT_EVERY == 0
+
+            if probe is not None:
+                temp, mem_usage = probe
+                alert = temp > 70 or mem_usage > 90
+                state_changed = alert != self._alert_state
+                self._alert_state = alert
+
+                if not (alert or state_changed or heartbeat_due):
+                    self.logger.info(f"Health OK: {temp:.1f}°C, {mem_usage:.0f}% memory used")
+                    self._next_interval = self._adapt_interval(temp, mem_usage)
+                    return True
+
+            metrics = await self.collect_all_metrics()
             self.save_metrics(metrics)
-            
+
             # Log key health indicators
             cpu_metrics = metrics.get('cpu_metrics', {})
             mem_metrics = metrics.get('memory_metrics', {})
-            
-            if 'cpu_temperature_c' in cpu_metrics:
-                temp = cpu_metrics['cpu_temperature_c']
-                if temp > 70:
-                    self.logger.warning(f"High CPU temperature: {temp}°C")
-                    
-            if 'memory' in mem_metrics:
-                mem_usage = mem_metrics['memory'].get('usage_percent', 0)
-                if mem_usage > 90:
-                    self.logger.warning(f"High memory usage: {mem_usage:.1f}%")
-                    
+
+            temp = cpu_metrics.get('cpu_temperature_c')
+            if temp is not None and temp > 70:
+                self.logger.warning(f"High CPU temperature: {temp}°C")
+
+            mem_usage = mem_metrics.get('memory', {}).get('usage_percent')
+            if mem_usage is not None and mem_usage > 90:
+                self.logger.warning(f"High memory usage: {mem_usage:.1f}%")
+
+            self._next_interval = self._adapt_interval(temp, mem_usage)
+
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Monitoring cycle failed: {e}")
             return False
 
-    def monitor_continuous(self, interval: int = 300) -> None:
-        """Run continuous monitoring with specified interval (seconds)"""
+    def _adapt_interval(self, temp: Optional[float], mem_usage: Optional[float]) -> int:
+        """Pick the next sampling interval from the latest health readings
+
+        Samples every 30 seconds when temperature or memory pressure is
+        approaching the alert thresholds, backs off to twice the base
+        interval (capped at 30 minutes) when the Pi is idle and cool, and
+        otherwise sticks with the configured interval.
+        """
+        if temp is None and mem_usage is None:
+            return self._base_interval
+
+        if (temp is not None and temp > 65) or (mem_usage is not None and mem_usage > 85):
+            return 30
+
+        if (temp is None or temp < 50) and (mem_usage is None or mem_usage < 50):
+            return min(self._base_interval * 2, 1800)
+
+        return self._base_interval
+
+    async def monitor_continuous(self, interval: int = 300) -> None:
+        """Run continuous monitoring with specified base interval (seconds)"""
         self.logger.info(f"Starting continuous monitoring every {interval} seconds")
-        
-        while True:
+        self._base_interval = interval
+        self._next_interval = interval
+
+        # Stop on SIGINT/SIGTERM by setting the event - the wait below
+        # wakes immediately instead of finishing a blind 300s sleep
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
             try:
-                success = self.monitor_once()
-                if not success:
-                    self.logger.error("Monitoring cycle failed, will retry next interval")
-                    
-                time.sleep(interval)
-                
-            except KeyboardInterrupt:
-                self.logger.info("Monitoring stopped by user")
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected error: {e}")
-                time.sleep(interval)
+                loop.add_signal_handler(sig, self._stop.set)
+            except NotImplementedError:
+                pass
+
+        # Hard per-cycle deadline: a wedged Pi or network flap cancels the
+        # in-flight commands instead of letting cycles overlap and queue up
+        # more SSH work than the daemon can absorb
+        deadline = interval * 0.8
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    try:
+                        success = await asyncio.wait_for(self.monitor_once(), timeout=deadline)
+                    except asyncio.TimeoutError:
+                        self.logger.error(f"Monitoring cycle exceeded {deadline:.0f}s deadline, "
+                                          "cancelled in-flight commands")
+                        success = False
+
+                    if not success:
+                        self.logger.error("Monitoring cycle failed, will retry next interval")
+
+                    if self._next_interval != interval:
+                        self.logger.info(f"Adaptive sampling: next cycle in {self._next_interval} seconds")
+
+                except Exception as e:
+                    self.logger.error(f"Unexpected error: {e}")
+
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self._next_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.aclose()
+
+        self.logger.info("Monitoring stopped")
 
 
 def main():
@@ -352,11 +888,24 @@ def main():
     args = parser.parse_args()
     
     monitor = RPiMonitor(args.hostname, args.username, args.key)
-    
-    if args.once:
-        monitor.monitor_once()
-    else:
-        monitor.monitor_continuous(args.interval)
+
+    # The connection must be closed inside the event loop it was opened
+    # on, so the teardown is awaited before asyncio.run() returns
+    async def run_once():
+        try:
+            await monitor.monitor_once()
+        finally:
+            await monitor.aclose()
+
+    try:
+        if args.once:
+            asyncio.run(run_once())
+        else:
+            asyncio.run(monitor.monitor_continuous(args.interval))
+    except KeyboardInterrupt:
+        monitor.logger.info("Monitoring stopped by user")
+    finally:
+        monitor.close()
 
 
 if __name__ == '__main__':